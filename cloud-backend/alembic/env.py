@@ -7,7 +7,7 @@ import sys
 # Add the parent directory to sys.path so we can import our app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 
-from app.database import Base
+from app.models import Base
 from app.config import settings
 
 # this is the Alembic Config object, which provides
@@ -28,7 +28,10 @@ target_metadata = Base.metadata
 # ... etc.
 
 def get_url():
-    return settings.DATABASE_URL
+    # The app config rewrites the URL to the async-only asyncpg driver;
+    # alembic runs on a sync engine, so strip the dialect suffix back to
+    # the default psycopg2 driver here
+    return settings.DATABASE_URL.replace("+asyncpg", "", 1)
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
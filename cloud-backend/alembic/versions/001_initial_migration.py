@@ -26,9 +26,13 @@ def upgrade():
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
-    op.create_index(op.f('ix_users_firebase_uid'), 'users', ['firebase_uid'], unique=True)
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    # CREATE INDEX CONCURRENTLY avoids the table-wide write lock a plain
+    # CREATE INDEX takes; it cannot run inside a transaction, hence the
+    # autocommit block
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_id ON users (id)")
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_firebase_uid ON users (firebase_uid)")
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email ON users (email)")
 
     # Create sessions table
     op.create_table('sessions',
@@ -43,7 +47,8 @@ def upgrade():
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_sessions_id'), 'sessions', ['id'], unique=False)
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sessions_id ON sessions (id)")
 
     # Create command_history table
     op.create_table('command_history',
@@ -58,7 +63,8 @@ def upgrade():
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_command_history_id'), 'command_history', ['id'], unique=False)
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_command_history_id ON command_history (id)")
 
     # Create file_operations table
     op.create_table('file_operations',
@@ -73,7 +79,8 @@ def upgrade():
         sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_file_operations_id'), 'file_operations', ['id'], unique=False)
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_file_operations_id ON file_operations (id)")
 
 def downgrade():
     op.drop_index(op.f('ix_file_operations_id'), table_name='file_operations')
@@ -0,0 +1,28 @@
+"""Server-generated UUID primary keys
+
+Revision ID: 002
+Revises: d7a947d78afa
+Create Date: 2025-08-29 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '002'
+down_revision = 'd7a947d78afa'
+branch_labels = None
+depends_on = None
+
+TABLES = ('users', 'sessions', 'command_history', 'file_operations')
+
+def upgrade():
+    # gen_random_uuid() is built in on Postgres 13+; the extension covers
+    # older servers
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('gen_random_uuid()::text'))
+
+def downgrade():
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=None)
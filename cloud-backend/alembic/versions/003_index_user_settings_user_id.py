@@ -0,0 +1,28 @@
+"""Unique index on user_settings.user_id
+
+Revision ID: 003
+Revises: 002
+Create Date: 2025-08-29 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Every settings request looks up by user_id; CONCURRENTLY avoids
+    # taking a write lock on the table while the index builds
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_user_settings_user_id ON user_settings (user_id)"
+        )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_settings_user_id")
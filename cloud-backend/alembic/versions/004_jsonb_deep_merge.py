@@ -0,0 +1,48 @@
+"""jsonb_deep_merge function for server-side settings patches
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-08-29 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+# Recursive merge of b into a, mirroring the Python _deep_merge used by
+# the settings router: objects merge key-wise, anything else is replaced
+JSONB_DEEP_MERGE = """
+CREATE OR REPLACE FUNCTION jsonb_deep_merge(a jsonb, b jsonb)
+RETURNS jsonb
+LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE
+AS $$
+BEGIN
+    IF jsonb_typeof(a) = 'object' AND jsonb_typeof(b) = 'object' THEN
+        RETURN (
+            SELECT COALESCE(jsonb_object_agg(key, CASE
+                WHEN a ? key AND b ? key THEN jsonb_deep_merge(a -> key, b -> key)
+                WHEN b ? key THEN b -> key
+                ELSE a -> key
+            END), '{}'::jsonb)
+            FROM (
+                SELECT jsonb_object_keys(a) AS key
+                UNION
+                SELECT jsonb_object_keys(b) AS key
+            ) AS keys
+        );
+    END IF;
+    RETURN COALESCE(b, a);
+END;
+$$
+"""
+
+def upgrade():
+    op.execute(JSONB_DEEP_MERGE)
+
+def downgrade():
+    op.execute("DROP FUNCTION IF EXISTS jsonb_deep_merge(jsonb, jsonb)")
@@ -0,0 +1,21 @@
+"""Server-generated id for user_settings
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-08-29 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.alter_column('user_settings', 'id', server_default=sa.text('gen_random_uuid()::text'))
+
+def downgrade():
+    op.alter_column('user_settings', 'id', server_default=None)
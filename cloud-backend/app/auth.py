@@ -1,43 +1,88 @@
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from firebase_admin import auth
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from cachetools import TTLCache
 from typing import Optional
-import uuid
+import asyncio
+import threading
+import time
 
-from .database import get_db, User as UserModel
+from sqlalchemy.orm import joinedload
+
+from .database import get_db, default_loader_options
+from .models import User as UserModel
 from .schemas import User
 
 security = HTTPBearer()
 
+# Cache decoded ID tokens so repeated requests with the same JWT skip
+# signature verification (and the public-key fetch behind it).
+# TTL stays well below the Firebase token lifetime of one hour.
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=300)
+# Cache resolved users so warm clients skip the DB round-trip entirely
+_user_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+_cache_lock = threading.Lock()
+
+async def _verify_id_token_cached(token: str) -> dict:
+    """Verify a Firebase ID token, serving repeated tokens from cache.
+
+    Cache misses run the synchronous SDK call in a worker thread so the
+    event loop keeps serving other requests during signature verification.
+    """
+    with _cache_lock:
+        entry = _token_cache.get(token)
+    if entry and entry["exp"] - 30 > time.time():
+        return entry["decoded"]
+
+    decoded = await asyncio.to_thread(auth.verify_id_token, token)
+    with _cache_lock:
+        _token_cache[token] = {"decoded": decoded, "exp": decoded["exp"]}
+    return decoded
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Validate Firebase token and return current user
     """
     try:
         # Verify Firebase token
-        decoded_token = auth.verify_id_token(credentials.credentials)
+        decoded_token = await _verify_id_token_cached(credentials.credentials)
         firebase_uid = decoded_token['uid']
-        
+
+        # Serve recently seen users straight from cache
+        with _cache_lock:
+            user = _user_cache.get(firebase_uid)
+        if user is not None:
+            return user
+
         # Get or create user in database
-        user = db.query(UserModel).filter(UserModel.firebase_uid == firebase_uid).first()
-        
+        result = await db.execute(
+            select(UserModel)
+            .where(UserModel.firebase_uid == firebase_uid)
+            .options(joinedload(UserModel.settings), *default_loader_options())
+        )
+        user = result.scalar_one_or_none()
+
         if not user:
             # Create new user from Firebase token
             user = UserModel(
-                id=str(uuid.uuid4()),
                 firebase_uid=firebase_uid,
                 email=decoded_token.get('email', ''),
                 name=decoded_token.get('name'),
                 photo_url=decoded_token.get('picture')
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
-        
+            # Server defaults come back via INSERT ... RETURNING, and
+            # expire_on_commit=False keeps them usable; no refresh needed
+            await db.commit()
+
+        with _cache_lock:
+            _user_cache[firebase_uid] = user
+
         return user
         
     except Exception as e:
@@ -52,7 +97,7 @@ async def verify_firebase_token(token: str) -> dict:
     Verify Firebase token and return decoded token
     """
     try:
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = await _verify_id_token_cached(token)
         return decoded_token
     except Exception as e:
         raise HTTPException(
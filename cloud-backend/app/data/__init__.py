@@ -0,0 +1,2 @@
+# Static JSON shipped with the app (release tables etc.), read through
+# importlib.resources so it works from wheels and containers alike
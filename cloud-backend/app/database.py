@@ -1,93 +1,55 @@
-from sqlalchemy import create_engine, Column, String, DateTime, Boolean, Text, Integer, ForeignKey, JSON
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy.sql import func
+import orjson
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import raiseload
 from .config import settings
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+def _json_serializer(obj) -> str:
+    # SQLAlchemy expects str from the serializer; orjson emits bytes
+    return orjson.dumps(obj).decode()
 
-class User(Base):
-    __tablename__ = "users"
-    
-    id = Column(String, primary_key=True, index=True)
-    firebase_uid = Column(String, unique=True, index=True, nullable=False)
-    email = Column(String, unique=True, index=True, nullable=False)
-    name = Column(String)
-    photo_url = Column(String)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    
-    # Relationships
-    sessions = relationship("Session", back_populates="user")
-    command_history = relationship("CommandHistory", back_populates="user")
-    settings = relationship("UserSettings", back_populates="user", uselist=False)
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    # Disable Postgres JIT to avoid asyncpg type-introspection stalls,
+    # and keep idle connections alive through NAT/load balancers
+    connect_args={"server_settings": {"jit": "off", "tcp_keepalives_idle": "30"}},
+)
+# expire_on_commit=False keeps loaded attributes usable after commit, so
+# handlers can serialize what they already have instead of re-SELECTing
+# every row post-commit
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
-class Session(Base):
-    __tablename__ = "sessions"
-    
-    id = Column(String, primary_key=True, index=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    name = Column(String)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    last_access = Column(DateTime(timezone=True), server_default=func.now())
-    
-    # Terminal session specific data
-    current_directory = Column(String, default="/")
-    environment_vars = Column(Text)  # JSON string
-    
-    # Relationships
-    user = relationship("User", back_populates="sessions")
-    command_history = relationship("CommandHistory", back_populates="session")
-
-class CommandHistory(Base):
-    __tablename__ = "command_history"
-    
-    id = Column(String, primary_key=True, index=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    session_id = Column(String, ForeignKey("sessions.id"))
-    command = Column(Text, nullable=False)
-    output = Column(Text)
-    exit_code = Column(Integer)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
-    
-    # Relationships
-    user = relationship("User", back_populates="command_history")
-    session = relationship("Session", back_populates="command_history")
-
-class FileOperation(Base):
-    __tablename__ = "file_operations"
-    
-    id = Column(String, primary_key=True, index=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    session_id = Column(String, ForeignKey("sessions.id"))
-    operation_type = Column(String, nullable=False)  # upload, download, create, delete
-    file_path = Column(String, nullable=False)
-    file_size = Column(Integer)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
-
-class UserSettings(Base):
-    __tablename__ = "user_settings"
-    
-    id = Column(String, primary_key=True, index=True)
-    user_id = Column(String, ForeignKey("users.id"), unique=True, nullable=False)
-    
-    # Settings data stored as JSON
-    settings_data = Column(JSON, nullable=False)
-    
-    # Metadata
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    
-    # Relationships
-    user = relationship("User", back_populates="settings")
+# Loader options applied to ORM queries in debug mode: accidental lazy
+# loads raise instead of silently issuing N+1 queries, so regressions
+# surface during development rather than in production throughput
+def default_loader_options():
+    return [raiseload("*")] if settings.DEBUG else []
 
 # Dependency to get database session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+# Batch helpers for seed scripts and data migrations: page through rows
+# and commit per page instead of holding one giant transaction
+async def paginate(db, stmt, page_size=1000):
+    offset = 0
+    while True:
+        result = await db.execute(stmt.limit(page_size).offset(offset))
+        rows = result.scalars().all()
+        if not rows:
+            return
+        yield rows
+        offset += page_size
+
+async def bulk_insert(db, model, mappings, page_size=1000):
+    """Insert row dicts in pages using executemany, committing per page"""
+    for start in range(0, len(mappings), page_size):
+        await db.execute(insert(model), mappings[start:start + page_size])
+        await db.commit()
@@ -1,12 +1,20 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Header
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from functools import lru_cache
+import hashlib
+import orjson
 import firebase_admin
 from firebase_admin import credentials, auth
-from .database import engine, Base
+from sqlalchemy import text as sa_text
+from .database import engine
+from .models import Base
 from .routers import auth_router, sessions_router, ai_router, settings_router
 from .routers.updates import router as updates_router, api_router as updates_api_router
 from .config import settings
+import asyncio
 import os
 from typing import Optional
 
@@ -20,19 +28,121 @@ if not firebase_admin._apps:
         cred = credentials.ApplicationDefault()
     firebase_admin.initialize_app(cred)
 
+# Exposed via /health so readiness probes can gate traffic while
+# schema creation runs in the background
+MIGRATION_STATE = "pending"
+
+# Strong reference to the background migration task: the event loop only
+# holds tasks weakly, so without this the task can be garbage-collected
+# mid-run and /health would report "running" forever
+_migration_task = None
+
+# The settings PATCH endpoint merges documents server-side through this
+# function. Alembic migration 004 also creates it, but deployments that
+# bootstrap via create_all never run alembic, so it is (re)created here
+# as well; CREATE OR REPLACE keeps both paths idempotent.
+_JSONB_DEEP_MERGE_DDL = """
+CREATE OR REPLACE FUNCTION jsonb_deep_merge(a jsonb, b jsonb)
+RETURNS jsonb
+LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE
+AS $$
+BEGIN
+    IF jsonb_typeof(a) = 'object' AND jsonb_typeof(b) = 'object' THEN
+        RETURN (
+            SELECT COALESCE(jsonb_object_agg(key, CASE
+                WHEN a ? key AND b ? key THEN jsonb_deep_merge(a -> key, b -> key)
+                WHEN b ? key THEN b -> key
+                ELSE a -> key
+            END), '{}'::jsonb)
+            FROM (
+                SELECT jsonb_object_keys(a) AS key
+                UNION
+                SELECT jsonb_object_keys(b) AS key
+            ) AS keys
+        );
+    END IF;
+    RETURN COALESCE(b, a);
+END;
+$$
+"""
+
+async def _run_migrations():
+    global MIGRATION_STATE
+    MIGRATION_STATE = "running"
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(sa_text(_JSONB_DEEP_MERGE_DDL))
+        MIGRATION_STATE = "done"
+    except Exception:
+        MIGRATION_STATE = "failed"
+        raise
+
+async def _warmup_pool():
+    """Open pool_size connections up front with concurrent SELECT 1s.
+
+    TLS + auth handshakes otherwise land on the first requests after
+    deploy, adding tens of milliseconds each until the pool fills.
+    """
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(sa_text("SELECT 1"))
+
+    try:
+        await asyncio.gather(*(ping() for _ in range(settings.DB_POOL_SIZE)))
+    except Exception:
+        # The database may still be coming up; normal pool checkout
+        # handles connections lazily from here
+        pass
+
+def _warmup_firebase():
+    """Force the SDK to fetch and cache Google's public certs at boot.
+
+    The first verify_id_token call on a fresh process pays the full
+    public-key fetch (seconds); verifying a dummy token absorbs that
+    cost at startup instead of on the first user request.
+    """
+    try:
+        auth.verify_id_token("invalid.jwt.token")
+    except Exception:
+        pass
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Create database tables
-    Base.metadata.create_all(bind=engine)
+    global MIGRATION_STATE, _migration_task
+    if settings.MIGRATION_MODE == "skip":
+        MIGRATION_STATE = "skipped"
+    elif settings.MIGRATION_MODE == "async":
+        # Serve traffic immediately; /health reports progress
+        _migration_task = asyncio.create_task(_run_migrations())
+    else:
+        await _run_migrations()
+    # Warm the Firebase public-key cache off the event loop
+    await asyncio.to_thread(_warmup_firebase)
+    # Fill the connection pool before the first request arrives
+    await _warmup_pool()
     yield
+    if _migration_task is not None:
+        # Let an in-flight schema build finish rather than tearing the
+        # engine down underneath it; failures were already recorded in
+        # MIGRATION_STATE by the task itself
+        try:
+            await _migration_task
+        except Exception:
+            pass
 
 app = FastAPI(
     title="CMDR Cloud Backend",
     description="Cloud backend for CMDR terminal sharing application",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Compress larger JSON payloads (changelogs etc.) on the wire
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -50,8 +160,33 @@ app.include_router(settings_router, prefix="/api/settings", tags=["settings"])
 app.include_router(updates_router, prefix="/api")
 app.include_router(updates_api_router)  # C client compatible endpoints
 
+# Lightweight router for unauthenticated poll endpoints: no DB
+# dependency, responses served from precomputed bytes
+public_router = APIRouter()
+
+_ROOT_BYTES = orjson.dumps({"message": "CMDR Cloud Backend API", "version": "1.0.0"})
+
+# The version payload only varies by (current_version, platform), so the
+# serialized body and its ETag are built once per combination
+@lru_cache(maxsize=512)
+def _build_version_response(current_version: str, platform: str) -> tuple:
+    payload = {
+        "updateAvailable": True,
+        "version": "1.2.0",
+        "currentVersion": current_version,
+        "downloadUrl": f"https://github.com/Ramachokkalingam/cmdr-code/releases/download/v1.2.0/cmdr-{platform}-x86_64",
+        "downloadSize": 2048576,
+        "checksum": "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+        "changelogUrl": "/api/version/changelog/1.2.0",
+        "critical": False,
+        "releaseDate": "2025-09-14T10:00:00Z"
+    }
+    body = orjson.dumps(payload)
+    etag = hashlib.sha256(body).hexdigest()[:16]
+    return body, etag
+
 # C client update endpoints (no auth required)
-@app.get("/version/check")
+@public_router.get("/version/check")
 async def check_version_c_client(
     current_version: Optional[str] = Header(None, alias="X-Current-Version"),
     platform: Optional[str] = Header(None, alias="X-Platform"),
@@ -60,27 +195,27 @@ async def check_version_c_client(
     """Check if an update is available for the C client (no auth required)"""
     if not current_version:
         raise HTTPException(400, "X-Current-Version header required")
-    
+
     if not platform:
         raise HTTPException(400, "X-Platform header required")
-    
-    # Mock response for now
-    return {
-        "updateAvailable": True,
-        "version": "1.2.0",
-        "currentVersion": current_version,
-        "downloadUrl": f"https://github.com/Ramachokkalingam/cmdr-code/releases/download/v1.2.0/cmdr-{platform}-x86_64",
-        "downloadSize": 2048576,
-        "checksum": "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
-        "changelog": "New update available with improvements!",
-        "critical": False,
-        "releaseDate": "2025-09-14T10:00:00Z"
-    }
 
-@app.get("/")
+    body, etag = _build_version_response(current_version, platform)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=300", "ETag": etag}
+    )
+
+@public_router.get("/")
 async def root():
-    return {"message": "CMDR Cloud Backend API", "version": "1.0.0"}
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
-@app.get("/health")
+@public_router.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return Response(
+        content=orjson.dumps({"status": "healthy", "migrations": MIGRATION_STATE}),
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"}
+    )
+
+app.include_router(public_router)
@@ -0,0 +1,84 @@
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, ForeignKey, JSON, text
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+Base = declarative_base()
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(String, primary_key=True, index=True, server_default=text("gen_random_uuid()::text"))
+    firebase_uid = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, unique=True, index=True, nullable=False)
+    name = Column(String)
+    photo_url = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    sessions = relationship("Session", back_populates="user")
+    command_history = relationship("CommandHistory", back_populates="user")
+    # 1:1 and almost always wanted when the user row is loaded, so fetch
+    # it in the same round trip instead of a lazy follow-up SELECT
+    settings = relationship("UserSettings", back_populates="user", uselist=False, lazy="joined")
+
+class Session(Base):
+    __tablename__ = "sessions"
+
+    id = Column(String, primary_key=True, index=True, server_default=text("gen_random_uuid()::text"))
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    name = Column(String)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_access = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Terminal session specific data
+    current_directory = Column(String, default="/")
+    environment_vars = Column(Text)  # JSON string
+
+    # Relationships
+    user = relationship("User", back_populates="sessions")
+    command_history = relationship("CommandHistory", back_populates="session")
+
+class CommandHistory(Base):
+    __tablename__ = "command_history"
+
+    id = Column(String, primary_key=True, index=True, server_default=text("gen_random_uuid()::text"))
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    session_id = Column(String, ForeignKey("sessions.id"))
+    command = Column(Text, nullable=False)
+    output = Column(Text)
+    exit_code = Column(Integer)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    user = relationship("User", back_populates="command_history")
+    session = relationship("Session", back_populates="command_history")
+
+class FileOperation(Base):
+    __tablename__ = "file_operations"
+
+    id = Column(String, primary_key=True, index=True, server_default=text("gen_random_uuid()::text"))
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    session_id = Column(String, ForeignKey("sessions.id"))
+    operation_type = Column(String, nullable=False)  # upload, download, create, delete
+    file_path = Column(String, nullable=False)
+    file_size = Column(Integer)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+
+class UserSettings(Base):
+    __tablename__ = "user_settings"
+
+    id = Column(String, primary_key=True, index=True, server_default=text("gen_random_uuid()::text"))
+    user_id = Column(String, ForeignKey("users.id"), unique=True, index=True, nullable=False)
+
+    # Settings data stored as JSON
+    settings_data = Column(JSON, nullable=False)
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    user = relationship("User", back_populates="settings")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_db
 from ..schemas import User, FirebaseToken
 from ..auth import verify_firebase_token, get_current_user
@@ -7,7 +7,7 @@ from ..auth import verify_firebase_token, get_current_user
 router = APIRouter()
 
 @router.post("/verify-token")
-async def verify_token(token_data: FirebaseToken, db: Session = Depends(get_db)):
+async def verify_token(token_data: FirebaseToken, db: AsyncSession = Depends(get_db)):
     """
     Verify Firebase token and return user info
     """
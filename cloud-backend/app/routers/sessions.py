@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any
-import uuid
 from datetime import datetime
 
-from ..database import get_db, Session as SessionModel
+from ..database import get_db
+from ..models import Session as SessionModel
 from ..schemas import Session, SessionCreate, User
 from ..auth import get_current_user
 
@@ -17,10 +18,11 @@ async def test_health():
     return {"status": "Sessions router is working", "timestamp": datetime.utcnow()}
 
 @router.get("/test/db")
-async def test_db(db: Session = Depends(get_db)):
+async def test_db(db: AsyncSession = Depends(get_db)):
     """Test database connectivity for sessions"""
     try:
-        count = db.query(SessionModel).count()
+        result = await db.execute(select(func.count()).select_from(SessionModel))
+        count = result.scalar()
         return {"status": "Database connected", "sessions_count": count}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -29,35 +31,42 @@ async def test_db(db: Session = Depends(get_db)):
 @router.get("/tabs", response_model=List[Dict[str, Any]])
 async def get_tabs(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all terminal tabs/sessions for the current user"""
-    sessions = db.query(SessionModel).filter(
-        SessionModel.user_id == current_user.id
-    ).order_by(SessionModel.last_access.desc()).all()
-    
+    # Project only the columns the response uses: skips ORM instance
+    # construction and avoids fetching environment_vars per row
+    result = await db.execute(
+        select(
+            SessionModel.id,
+            SessionModel.name,
+            SessionModel.current_directory,
+            SessionModel.last_access
+        ).where(
+            SessionModel.user_id == current_user.id
+        ).order_by(SessionModel.last_access.desc())
+    )
+
     # Return simplified tab info
-    tabs = []
-    for session in sessions:
-        tabs.append({
-            "id": session.id,
-            "name": session.name or f"Tab {session.id[:8]}",
-            "current_directory": session.current_directory or "~",
-            "last_access": session.last_access,
+    return [
+        {
+            "id": row.id,
+            "name": row.name or f"Tab {row.id[:8]}",
+            "current_directory": row.current_directory or "~",
+            "last_access": row.last_access,
             "is_active": True  # Simplified - assume all are active
-        })
-    
-    return tabs
+        }
+        for row in result.all()
+    ]
 
 @router.post("/tabs", response_model=Dict[str, Any])
 async def create_tab(
     session_data: SessionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new terminal tab/session"""
     new_session = SessionModel(
-        id=str(uuid.uuid4()),
         user_id=current_user.id,
         name=session_data.name or f"Tab {datetime.now().strftime('%H:%M')}",
         current_directory=session_data.current_directory or "~",
@@ -65,9 +74,8 @@ async def create_tab(
     )
     
     db.add(new_session)
-    db.commit()
-    db.refresh(new_session)
-    
+    await db.commit()
+
     return {
         "id": new_session.id,
         "name": new_session.name,
@@ -80,41 +88,49 @@ async def create_tab(
 async def close_tab(
     tab_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Close/delete a terminal tab"""
-    session = db.query(SessionModel).filter(
-        SessionModel.id == tab_id,
-        SessionModel.user_id == current_user.id
-    ).first()
-    
-    if not session:
+    result = await db.execute(
+        delete(SessionModel).where(
+            SessionModel.id == tab_id,
+            SessionModel.user_id == current_user.id
+        ).returning(SessionModel.name)
+    )
+    row = result.first()
+
+    if row is None:
         raise HTTPException(status_code=404, detail="Tab not found")
-    
-    db.delete(session)
-    db.commit()
-    
-    return {"message": f"Tab {session.name} closed successfully"}
+
+    await db.commit()
+
+    return {"message": f"Tab {row.name} closed successfully"}
 
 @router.put("/tabs/{tab_id}/directory")
 async def update_tab_directory(
     tab_id: str,
     directory: Dict[str, str],
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update the current directory for a tab"""
-    session = db.query(SessionModel).filter(
-        SessionModel.id == tab_id,
-        SessionModel.user_id == current_user.id
-    ).first()
-    
-    if not session:
+    # Single UPDATE round trip with a DB-authoritative timestamp instead
+    # of a SELECT-then-UPDATE read-modify-write
+    values = {"last_access": func.now()}
+    if directory.get("directory"):
+        values["current_directory"] = directory["directory"]
+
+    result = await db.execute(
+        update(SessionModel).where(
+            SessionModel.id == tab_id,
+            SessionModel.user_id == current_user.id
+        ).values(**values).returning(SessionModel.current_directory)
+    )
+    row = result.first()
+
+    if row is None:
         raise HTTPException(status_code=404, detail="Tab not found")
-    
-    session.current_directory = directory.get("directory", session.current_directory)
-    session.last_access = datetime.utcnow()
-    
-    db.commit()
-    
-    return {"message": "Directory updated", "current_directory": session.current_directory}
+
+    await db.commit()
+
+    return {"message": "Directory updated", "current_directory": row.current_directory}
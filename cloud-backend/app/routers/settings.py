@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy import select, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import flag_modified
 from typing import Dict, Any
-import uuid
+import copy
 import json
 
-from ..database import get_db, User, UserSettings
-from ..schemas import UserSettings as UserSettingsSchema, UserSettingsCreate, UserSettingsUpdate, CmdrSettingsSchema
+from ..database import get_db
+from ..models import User, UserSettings
+from ..schemas import UserSettingsCreate, UserSettingsUpdate, SettingsPatch, SHORTCUTS_ADAPTER, SETTINGS_ADAPTER
 from ..auth import get_current_user
 
 router = APIRouter()
 
-def get_default_settings() -> Dict[str, Any]:
-    """Get default settings structure"""
+def _build_default_settings() -> Dict[str, Any]:
+    """Build the default settings structure"""
     return {
         "version": "1.0.0",
         "font": {
@@ -151,186 +158,315 @@ def get_default_settings() -> Dict[str, Any]:
         }
     }
 
+# Built once at import; the giant literal is pure allocator overhead if
+# rebuilt per request
+_DEFAULT_SETTINGS = _build_default_settings()
+
+def get_default_settings() -> Dict[str, Any]:
+    """Get a private copy of the default settings for callers that mutate it"""
+    return copy.deepcopy(_DEFAULT_SETTINGS)
+
+def _deep_merge(base: dict, update: dict) -> dict:
+    """Merge update into base in place, iterating with an explicit stack.
+
+    Avoids the per-level dict.copy() and recursion of the old closure-based
+    merge; callers that need a fresh object for ORM change detection pass a
+    shallow copy as base.
+    """
+    stack = [(base, update)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            existing = target.get(key)
+            if type(value) is dict and type(existing) is dict:
+                stack.append((existing, value))
+            else:
+                target[key] = value
+    return base
+
+# Top-level groups that are nested dicts, derived from the defaults once;
+# lets the top level of a merge route each key by a frozenset lookup
+# instead of type-inspecting both sides
+_NESTED_KEYS = frozenset(k for k, v in _DEFAULT_SETTINGS.items() if type(v) is dict)
+
+def _merge_settings(base: dict, update: dict) -> dict:
+    """Merge a settings patch into base at the document's top level"""
+    for key, value in update.items():
+        if key in _NESTED_KEYS and type(value) is dict and type(base.get(key)) is dict:
+            _deep_merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+def _settings_response(row: UserSettings) -> Dict[str, Any]:
+    """Plain-dict response body for a settings row"""
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "settings_data": row.settings_data,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at
+    }
+
+def _validate_shortcuts(settings_data: Any) -> None:
+    """Reject malformed keyboardShortcuts lists before they are stored.
+
+    Shortcut entries drive client keybinding dispatch, and POST/PUT
+    replace the list wholesale; the shared adapter (compiled once at
+    import) checks the fragment so broken entries 422 here instead of
+    persisting and breaking clients on load.
+    """
+    if not isinstance(settings_data, dict):
+        return
+    shortcuts = settings_data.get("keyboardShortcuts")
+    if shortcuts is None:
+        return
+    try:
+        SHORTCUTS_ADAPTER.validate_python(shortcuts)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False)
+        )
+
+# Settings are read on every client connect but written rarely; cache the
+# document per user and drop the entry on any write
+_settings_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+async def _upsert_settings(db: AsyncSession, user_id: str, settings_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Write settings in a single INSERT ... ON CONFLICT round trip.
+
+    Replaces the select-then-insert dance (two round trips plus a race
+    window between them) for endpoints that overwrite the whole document.
+    """
+    stmt = (
+        pg_insert(UserSettings)
+        .values(user_id=user_id, settings_data=settings_data)
+        .on_conflict_do_update(
+            index_elements=[UserSettings.user_id],
+            set_={"settings_data": settings_data, "updated_at": func.now()}
+        )
+        .returning(UserSettings.settings_data)
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    _settings_cache.pop(user_id, None)
+    return result.scalar_one()
+
 @router.get("/", response_model=Dict[str, Any])
 async def get_user_settings(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get current user's settings"""
-    user_settings = db.query(UserSettings).filter(UserSettings.user_id == current_user.id).first()
-    
+    cached = _settings_cache.get(current_user.id)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(UserSettings).where(UserSettings.user_id == current_user.id))
+    user_settings = result.scalar_one_or_none()
+
     if not user_settings:
-        # Return default settings if none exist
-        return get_default_settings()
-    
+        # Return default settings if none exist; the shared object is
+        # safe to serialize directly since nothing mutates it
+        return _DEFAULT_SETTINGS
+
+    _settings_cache[current_user.id] = user_settings.settings_data
     return user_settings.settings_data
 
-@router.post("/", response_model=UserSettingsSchema)
+@router.post("/")
 async def create_user_settings(
     settings: UserSettingsCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create new user settings"""
-    # Check if settings already exist
-    existing_settings = db.query(UserSettings).filter(UserSettings.user_id == current_user.id).first()
-    if existing_settings:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User settings already exist. Use PUT to update."
-        )
-    
+    _validate_shortcuts(settings.settings_data)
+
     # Validate settings structure
     try:
-        # Merge with defaults to ensure all required fields are present
-        default_settings = get_default_settings()
-        merged_settings = {**default_settings, **settings.settings_data}
-        
-        # Create new settings
-        db_settings = UserSettings(
-            id=str(uuid.uuid4()),
-            user_id=current_user.id,
-            settings_data=merged_settings
+        # Merge with defaults to ensure all required fields are present;
+        # deep merge so a partial group (e.g. just font.size) keeps the
+        # rest of that group's defaults instead of replacing the group
+        merged_settings = _merge_settings(get_default_settings(), settings.settings_data)
+
+        # Single round trip: the existence check rides on the insert
+        # itself instead of a separate SELECT
+        stmt = (
+            pg_insert(UserSettings)
+            .values(
+                user_id=current_user.id,
+                settings_data=merged_settings
+            )
+            .on_conflict_do_nothing(index_elements=[UserSettings.user_id])
+            .returning(UserSettings)
         )
-        
-        db.add(db_settings)
-        db.commit()
-        db.refresh(db_settings)
-        
-        return db_settings
-    except Exception as e:
+        result = await db.execute(stmt)
+        db_settings = result.scalars().first()
+        if db_settings is None:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User settings already exist. Use PUT to update."
+            )
+        await db.commit()
+        _settings_cache.pop(current_user.id, None)
+
+        # Serialize straight from the row we already hold; re-validating
+        # the whole document through the response model doubles the cost
+        # of every write
+        return _settings_response(db_settings)
+    except SQLAlchemyError:
+        # Only database failures are expected here; anything else is a
+        # bug and should surface as such rather than a misleading 400
+        await db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid settings format: {str(e)}"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save settings"
         )
 
-@router.put("/", response_model=UserSettingsSchema)
+@router.put("/")
 async def update_user_settings(
     settings: UserSettingsUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update user settings"""
-    user_settings = db.query(UserSettings).filter(UserSettings.user_id == current_user.id).first()
+    result = await db.execute(select(UserSettings).where(UserSettings.user_id == current_user.id))
+    user_settings = result.scalar_one_or_none()
     
     if not user_settings:
         # Create settings if they don't exist
         user_settings = UserSettings(
-            id=str(uuid.uuid4()),
             user_id=current_user.id,
             settings_data=get_default_settings()
         )
         db.add(user_settings)
     
     if settings.settings_data:
+        # settings_data is typed Any to skip the recursive dict walk, so
+        # the top-level shape check lives here: anything but an object
+        # is a client error, not a merge crash
+        if not isinstance(settings.settings_data, dict):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="settings_data must be an object"
+            )
+        _validate_shortcuts(settings.settings_data)
         try:
-            # Deep merge the settings
-            def deep_merge(base: dict, update: dict) -> dict:
-                result = base.copy()
-                for key, value in update.items():
-                    if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                        result[key] = deep_merge(result[key], value)
-                    else:
-                        result[key] = value
-                return result
-            
-            user_settings.settings_data = deep_merge(user_settings.settings_data, settings.settings_data)
-            
-            db.commit()
-            db.refresh(user_settings)
-            
-            return user_settings
-        except Exception as e:
+            # Merge in place and tell SQLAlchemy exactly which column
+            # changed; cheaper than rebuilding the dict so the ORM can
+            # diff it
+            _merge_settings(user_settings.settings_data, settings.settings_data)
+            flag_modified(user_settings, "settings_data")
+
+            await db.commit()
+            # updated_at has a SQL-side onupdate, so the UPDATE flush
+            # expires it (expire_on_commit=False doesn't cover that);
+            # reload just that column instead of tripping a lazy load
+            # while building the response
+            await db.refresh(user_settings, attribute_names=["updated_at"])
+            _settings_cache.pop(current_user.id, None)
+
+            return _settings_response(user_settings)
+        except SQLAlchemyError:
+            await db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid settings format: {str(e)}"
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to save settings"
             )
-    
-    return user_settings
 
-@router.patch("/", response_model=Dict[str, Any])
+    return _settings_response(user_settings)
+
+@router.patch("/")
 async def patch_user_settings(
-    settings_patch: Dict[str, Any],
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Patch specific settings fields"""
-    user_settings = db.query(UserSettings).filter(UserSettings.user_id == current_user.id).first()
-    
-    if not user_settings:
-        # Create settings if they don't exist
-        user_settings = UserSettings(
-            id=str(uuid.uuid4()),
-            user_id=current_user.id,
-            settings_data=get_default_settings()
+    # model_validate_json parses and validates the raw body in a single
+    # pass, skipping the intermediate json.loads -> dict -> validate hop
+    try:
+        patch = SettingsPatch.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False)
         )
-        db.add(user_settings)
-    
+
+    # exclude_unset keeps the patch sparse: only keys the client actually
+    # sent reach the merge, so nested defaults never clobber stored values
+    settings_patch = patch.model_dump(exclude_unset=True)
     try:
-        # Apply patch to settings
-        def apply_patch(obj: dict, patch: dict, path: str = "") -> dict:
-            result = obj.copy()
-            for key, value in patch.items():
-                current_path = f"{path}.{key}" if path else key
-                if isinstance(value, dict) and key in result and isinstance(result[key], dict):
-                    result[key] = apply_patch(result[key], value, current_path)
-                else:
-                    result[key] = value
-            return result
-        
-        user_settings.settings_data = apply_patch(user_settings.settings_data, settings_patch)
-        
-        db.commit()
-        db.refresh(user_settings)
-        
-        return user_settings.settings_data
-    except Exception as e:
+        # Merge inside Postgres: the document never crosses the wire, so
+        # a small patch costs one UPDATE instead of SELECT + full-row write
+        result = await db.execute(
+            text(
+                # settings_data is a json column and Postgres has no
+                # jsonb -> json assignment cast, so cast the merge result
+                # back explicitly
+                "UPDATE user_settings "
+                "SET settings_data = jsonb_deep_merge(settings_data::jsonb, (:patch)::jsonb)::json, "
+                "updated_at = now() "
+                "WHERE user_id = :user_id "
+                "RETURNING settings_data"
+            ),
+            {"patch": json.dumps(settings_patch), "user_id": current_user.id}
+        )
+        settings_data = result.scalar_one_or_none()
+
+        if settings_data is None:
+            # No row yet; seed defaults with the patch applied
+            return await _upsert_settings(
+                db, current_user.id,
+                _merge_settings(get_default_settings(), settings_patch)
+            )
+
+        await db.commit()
+        _settings_cache.pop(current_user.id, None)
+        return settings_data
+    except SQLAlchemyError:
+        await db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid settings patch: {str(e)}"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save settings"
         )
 
 @router.delete("/")
 async def delete_user_settings(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete user settings (reset to defaults)"""
-    user_settings = db.query(UserSettings).filter(UserSettings.user_id == current_user.id).first()
+    result = await db.execute(select(UserSettings).where(UserSettings.user_id == current_user.id))
+    user_settings = result.scalar_one_or_none()
     
     if user_settings:
-        db.delete(user_settings)
-        db.commit()
-    
+        await db.delete(user_settings)
+        await db.commit()
+
+    _settings_cache.pop(current_user.id, None)
     return {"message": "Settings reset to defaults"}
 
 @router.post("/reset")
 async def reset_user_settings(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Reset user settings to defaults"""
-    user_settings = db.query(UserSettings).filter(UserSettings.user_id == current_user.id).first()
-    
-    if not user_settings:
-        user_settings = UserSettings(
-            id=str(uuid.uuid4()),
-            user_id=current_user.id,
-            settings_data=get_default_settings()
-        )
-        db.add(user_settings)
-    else:
-        user_settings.settings_data = get_default_settings()
-    
-    db.commit()
-    db.refresh(user_settings)
-    
-    return {"message": "Settings reset to defaults", "settings": user_settings.settings_data}
+    settings_data = await _upsert_settings(db, current_user.id, get_default_settings())
+
+    return {"message": "Settings reset to defaults", "settings": settings_data}
+
+# Static per process: generating the JSON schema walks the whole model
+# tree and allocates a fresh nested dict on every call
+_SCHEMA_RESPONSE = {
+    "schema": SETTINGS_ADAPTER.json_schema(),
+    "example": _DEFAULT_SETTINGS
+}
 
 @router.get("/schema")
 async def get_settings_schema():
     """Get the settings schema for validation"""
-    return {
-        "schema": CmdrSettingsSchema.model_json_schema(),
-        "example": get_default_settings()
-    }
+    return _SCHEMA_RESPONSE
@@ -1,20 +1,26 @@
-from fastapi import APIRouter, Header, HTTPException, Depends, Query
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Header, HTTPException, Depends, Query, Response
+from fastapi.responses import FileResponse, ORJSONResponse
 from ..schemas import UpdateResponse, UpdateInfo, User
 from ..auth import get_current_user
+import functools
 import os
-import json
+import orjson
 import hashlib
-from typing import Optional
-import semver
-import subprocess
+from typing import Literal, Optional
+import re
 import asyncio
+import threading
+import time
 from datetime import datetime
+from importlib import resources
+import logging
 
-router = APIRouter(prefix="/version", tags=["updates"])
+logger = logging.getLogger("cmdr.updates")
+
+router = APIRouter(prefix="/version", tags=["updates"], default_response_class=ORJSONResponse)
 
 # Additional router for C client compatibility
-api_router = APIRouter(prefix="/api", tags=["updates-api"])
+api_router = APIRouter(prefix="/api", tags=["updates-api"], default_response_class=ORJSONResponse)
 
 # Configuration - In production, these should come from environment variables
 RELEASES_DIR = os.getenv("RELEASES_DIR", "/app/releases")
@@ -30,59 +36,69 @@ PLATFORM_MAPPING = {
     "darwin": "macos-x86_64"
 }
 
+# Canonical name per expected case variant, built once; the hot path
+# resolves a platform header with a single dict probe instead of
+# lowercasing every request (the .lower() fallback still catches
+# anything unusual)
+_PLATFORM_CANON = {}
+for _name in PLATFORM_MAPPING:
+    for _variant in (_name, _name.upper(), _name.capitalize()):
+        _PLATFORM_CANON[_variant] = _name
+
+def _canonical_platform(platform: str) -> Optional[str]:
+    return _PLATFORM_CANON.get(platform) or _PLATFORM_CANON.get(platform.lower())
+
+# Declarative header types: FastAPI rejects malformed values during
+# request parsing, so handlers never see them. The Literal spells out the
+# same case variants _PLATFORM_CANON is built from.
+PlatformHeader = Literal[
+    "linux", "Linux", "LINUX",
+    "windows", "Windows", "WINDOWS",
+    "macos", "Macos", "MACOS",
+    "darwin", "Darwin", "DARWIN",
+]
+_VERSION_PATTERN = r"^\d+\.\d+\.\d+$"
+
+# Release tables ship as JSON data files instead of module literals;
+# importlib.resources keeps the lookup package-relative and lru_cache
+# makes each file a one-time read per process
+@functools.lru_cache(maxsize=1)
+def _load_releases() -> dict:
+    return orjson.loads(resources.files("app.data").joinpath("releases.json").read_bytes())
+
+@functools.lru_cache(maxsize=1)
+def _load_default_release_config() -> dict:
+    return orjson.loads(resources.files("app.data").joinpath("default_release_config.json").read_bytes())
+
 # Mock release data for C client compatibility
-RELEASES = {
-    "1.2.0": {
-        "version": "1.2.0",
-        "releaseDate": "2025-09-14T10:00:00Z",
-        "critical": False,
-        "changelog": """## What's New in v1.2.0
-
-### Features
-- 🚀 Auto-update system implementation
-- 📱 Enhanced WebSocket protocol for real-time updates  
-- 🔐 Improved session persistence
-- 🎨 Better terminal UI with progress indicators
-
-### Bug Fixes
-- Fixed memory leaks in terminal buffer management
-- Resolved WebSocket connection issues on slow networks
-- Fixed session restoration edge cases
-
-### Performance
-- 30% faster terminal rendering
-- Reduced memory usage by 20%
-- Optimized JSON parsing
-        """,
-        "downloadSizes": {
-            "linux": 2048576,    # 2MB
-            "windows": 2359296,  # 2.25MB  
-            "macos": 2097152     # 2MB
-        },
-        "checksums": {
-            "linux": "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
-            "windows": "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b856", 
-            "macos": "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b857"
-        }
-    },
-    "1.1.0": {
-        "version": "1.1.0", 
-        "releaseDate": "2025-09-01T10:00:00Z",
-        "critical": False,
-        "changelog": "Previous version with basic functionality",
-        "downloadSizes": {
-            "linux": 1048576,
-            "windows": 1310720,
-            "macos": 1048576  
-        },
-        "checksums": {
-            "linux": "d3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
-            "windows": "d3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b856",
-            "macos": "d3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b857"
-        }
-    }
+RELEASES = _load_releases()
+
+# Download URLs for the static release table, formatted once at import
+# instead of string-built per request
+_DOWNLOAD_URLS = {
+    (version, platform): f"{DOWNLOAD_BASE_URL}/v{version}/cmdr-{platform_file}"
+    for version in RELEASES
+    for platform, platform_file in PLATFORM_MAPPING.items()
 }
 
+# Strict X.Y.Z parser: a compiled regex plus int() covers every version
+# this server ever emits, without pulling in the semver package just for
+# the C client check
+_VER_RE = re.compile(r"^(\d+)\.(\d+)\.(\d+)$")
+
+@functools.lru_cache(maxsize=512)
+def _parse_strict(version: str) -> tuple:
+    match = _VER_RE.match(version)
+    if match is None:
+        raise ValueError(f"Invalid version: {version}")
+    return tuple(int(part) for part in match.groups())
+
+# The client fleet only runs a handful of distinct versions, so memoize
+# the comparison as well as the parse
+@functools.lru_cache(maxsize=512)
+def _is_newer(latest: str, current: str) -> bool:
+    return _parse_strict(latest) > _parse_strict(current)
+
 # Add C client compatible endpoints
 @api_router.get("/test")
 async def test_endpoint():
@@ -91,28 +107,24 @@ async def test_endpoint():
 
 @api_router.get("/version/check")
 async def check_version_c_client(
-    current_version: Optional[str] = Header(None, alias="X-Current-Version"),
-    platform: Optional[str] = Header(None, alias="X-Platform"),
+    current_version: Optional[str] = Header(None, alias="X-Current-Version", pattern=_VERSION_PATTERN),
+    platform: Optional[PlatformHeader] = Header(None, alias="X-Platform"),
     user_agent: Optional[str] = Header(None, alias="User-Agent")
 ):
     """Check if an update is available for the C client"""
     if not current_version:
         raise HTTPException(400, "X-Current-Version header required")
-    
+
     if not platform:
         raise HTTPException(400, "X-Platform header required")
-    
-    # Normalize platform
-    normalized_platform = platform.lower()
-    if normalized_platform not in PLATFORM_MAPPING:
-        raise HTTPException(400, f"Unsupported platform: {platform}")
-    
-    try:
-        # Compare versions using semantic versioning
-        has_update = semver.compare(CURRENT_VERSION, current_version) > 0
-    except ValueError:
-        raise HTTPException(400, f"Invalid version format: {current_version}")
-    
+
+    # Normalize platform (already vetted by the header type)
+    normalized_platform = _canonical_platform(platform)
+
+    # Compare versions using semantic versioning; the header pattern
+    # guarantees a parseable X.Y.Z
+    has_update = _is_newer(CURRENT_VERSION, current_version)
+
     if not has_update:
         return {
             "updateAvailable": False,
@@ -126,9 +138,8 @@ async def check_version_c_client(
     if not latest_release:
         raise HTTPException(500, "Release information not found")
     
-    platform_file = PLATFORM_MAPPING[normalized_platform]
-    download_url = f"{DOWNLOAD_BASE_URL}/v{CURRENT_VERSION}/cmdr-{platform_file}"
-    
+    download_url = _DOWNLOAD_URLS[(CURRENT_VERSION, normalized_platform)]
+
     return {
         "updateAvailable": True,
         "version": CURRENT_VERSION,
@@ -136,26 +147,42 @@ async def check_version_c_client(
         "downloadUrl": download_url,
         "downloadSize": latest_release["downloadSizes"].get(normalized_platform, 0),
         "checksum": latest_release["checksums"].get(normalized_platform),
-        "changelog": latest_release["changelog"],
+        "changelogUrl": f"/api/version/changelog/{CURRENT_VERSION}",
         "critical": latest_release["critical"],
         "releaseDate": latest_release["releaseDate"],
         "rolloutPercentage": 100
     }
 
+@api_router.get("/version/changelog/{version}")
+async def get_changelog(version: str):
+    """Changelog for a released version.
+
+    Split out of the check response: every poll used to carry the full
+    markdown body, but clients only need it when an update is actually
+    shown. Released changelogs never change, hence the immutable cache.
+    """
+    release = RELEASES.get(version)
+    if release is None:
+        raise HTTPException(404, f"Version {version} not found")
+    return Response(
+        content=release["changelog"],
+        media_type="text/markdown",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
 @api_router.get("/version/download/{version}/{platform}")
 async def download_version_c_client(version: str, platform: str):
     """Get download information for C client"""
     if version not in RELEASES:
         raise HTTPException(404, f"Version {version} not found")
     
-    normalized_platform = platform.lower()
-    if normalized_platform not in PLATFORM_MAPPING:
+    normalized_platform = _canonical_platform(platform)
+    if normalized_platform is None:
         raise HTTPException(400, f"Unsupported platform: {platform}")
-    
+
     release = RELEASES[version]
-    platform_file = PLATFORM_MAPPING[normalized_platform]
-    download_url = f"{DOWNLOAD_BASE_URL}/v{version}/cmdr-{platform_file}"
-    
+    download_url = _DOWNLOAD_URLS[(version, normalized_platform)]
+
     return {
         "version": version,
         "platform": platform,
@@ -167,79 +194,114 @@ async def download_version_c_client(version: str, platform: str):
 RELEASE_CONFIG_FILE = os.path.join(RELEASES_DIR, "release-config.json")
 
 # Default release configuration
-DEFAULT_RELEASE_CONFIG = {
-    "latest_version": "1.0.0",
-    "releases": {
-        "1.0.0": {
-            "mandatory": False,
-            "release_notes": "Initial release of CMDR v1.0.0\n• Terminal sharing functionality\n• Web-based interface\n• Session persistence\n• Multi-platform support",
-            "files": {
-                "windows": {
-                    "filename": "cmdr-1.0.0-windows.exe",
-                    "size": 15728640,
-                    "checksum": "a1b2c3d4e5f6"
-                },
-                "macos": {
-                    "filename": "cmdr-1.0.0-macos.dmg", 
-                    "size": 18874368,
-                    "checksum": "b2c3d4e5f6a1"
-                },
-                "linux": {
-                    "filename": "cmdr-1.0.0-linux.AppImage",
-                    "size": 16777216,
-                    "checksum": "c3d4e5f6a1b2"
-                },
-                "web": {
-                    "filename": "cmdr-1.0.0-web.tar.gz",
-                    "size": 5242880,
-                    "checksum": "d4e5f6a1b2c3"
-                }
-            }
-        }
-    }
-}
+DEFAULT_RELEASE_CONFIG = _load_default_release_config()
+
+# The releases directory only needs creating once per process; skip the
+# syscall on every subsequent config read/write
+_releases_dir_ready = False
+
+def _ensure_releases_dir():
+    global _releases_dir_ready
+    if not _releases_dir_ready:
+        os.makedirs(os.path.dirname(RELEASE_CONFIG_FILE), exist_ok=True)
+        _releases_dir_ready = True
+
+# Parsed release config cached by file mtime: every update poll calls
+# load_release_config, so only re-read and re-parse when the file changed.
+# Failures are cached briefly too, so a broken or missing file doesn't
+# turn every poll into a stat + failed parse.
+_config_cache = {"mtime": None, "data": None, "versions": None, "failed_until": 0.0}
+_config_lock = threading.Lock()
+
+def _version_index(config: dict) -> list:
+    """Release versions sorted ascending by parsed tuple"""
+    parsed = []
+    for version in config.get("releases", {}):
+        try:
+            parsed.append((_parse_version(version), version))
+        except ValueError:
+            continue
+    parsed.sort()
+    return [version for _, version in parsed]
+
+def latest_release_version(config: dict) -> str:
+    """Newest version in the config, by numeric ordering.
+
+    Uses the index built at config load when available, so polls don't
+    re-sort; deriving it from the release keys also means a stale
+    latest_version field can't point below the newest published release.
+    """
+    if config is _config_cache["data"] and _config_cache["versions"]:
+        return _config_cache["versions"][-1]
+    index = _version_index(config)
+    return index[-1] if index else config.get("latest_version", CURRENT_VERSION)
 
 def load_release_config() -> dict:
     """Load release configuration from file or return default"""
     try:
+        if _config_cache["failed_until"] > time.monotonic():
+            return DEFAULT_RELEASE_CONFIG
         if os.path.exists(RELEASE_CONFIG_FILE):
-            with open(RELEASE_CONFIG_FILE, 'r') as f:
-                return json.load(f)
+            st = os.stat(RELEASE_CONFIG_FILE)
+            if _config_cache["mtime"] == st.st_mtime_ns:
+                return _config_cache["data"]
+            with _config_lock:
+                # Re-check under the lock so concurrent misses parse once
+                if _config_cache["mtime"] == st.st_mtime_ns:
+                    return _config_cache["data"]
+                with open(RELEASE_CONFIG_FILE, 'rb') as f:
+                    data = orjson.loads(f.read())
+                _config_cache["data"] = data
+                _config_cache["versions"] = _version_index(data)
+                _config_cache["mtime"] = st.st_mtime_ns
+                _SERIALIZED_UPDATE_CACHE.clear()
+            return data
         else:
             # Create default config file
-            os.makedirs(os.path.dirname(RELEASE_CONFIG_FILE), exist_ok=True)
+            _ensure_releases_dir()
             save_release_config(DEFAULT_RELEASE_CONFIG)
             return DEFAULT_RELEASE_CONFIG
     except Exception as e:
-        print(f"Error loading release config: {e}")
+        logger.exception("Error loading release config")
+        _config_cache["failed_until"] = time.monotonic() + 5.0
         return DEFAULT_RELEASE_CONFIG
 
 def save_release_config(config: dict):
     """Save release configuration to file"""
     try:
-        os.makedirs(os.path.dirname(RELEASE_CONFIG_FILE), exist_ok=True)
-        with open(RELEASE_CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        _ensure_releases_dir()
+        with open(RELEASE_CONFIG_FILE, 'wb') as f:
+            f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        _config_cache["mtime"] = None
+        _config_cache["failed_until"] = 0.0
+        _SERIALIZED_UPDATE_CACHE.clear()
     except Exception as e:
-        print(f"Error saving release config: {e}")
+        logger.exception("Error saving release config")
+
+@functools.lru_cache(maxsize=512)
+def _parse_version(version: str) -> tuple:
+    """Parse 'X.Y.Z' into an int tuple, cached since the set of versions
+    seen in the wild is small"""
+    return tuple(int(x) for x in version.split('.'))
+
+# The mock release table and server version are fixed for the process
+# lifetime; parse them once at import instead of per request
+_CURRENT_TUPLE = _parse_version(CURRENT_VERSION)
+_PARSED_RELEASES = {version: _parse_version(version) for version in RELEASES}
 
 def compare_versions(version1: str, version2: str) -> int:
     """Compare two semantic versions. Returns -1, 0, or 1"""
     try:
-        v1_parts = [int(x) for x in version1.split('.')]
-        v2_parts = [int(x) for x in version2.split('.')]
-        
-        # Pad with zeros if needed
-        max_len = max(len(v1_parts), len(v2_parts))
-        v1_parts.extend([0] * (max_len - len(v1_parts)))
-        v2_parts.extend([0] * (max_len - len(v2_parts)))
-        
-        for i in range(max_len):
-            if v1_parts[i] < v2_parts[i]:
-                return -1
-            elif v1_parts[i] > v2_parts[i]:
-                return 1
-        return 0
+        v1 = _parse_version(version1)
+        v2 = _parse_version(version2)
+
+        # Pad with zeros so 1.2 compares equal to 1.2.0
+        if len(v1) != len(v2):
+            max_len = max(len(v1), len(v2))
+            v1 += (0,) * (max_len - len(v1))
+            v2 += (0,) * (max_len - len(v2))
+
+        return (v1 > v2) - (v1 < v2)
     except:
         # Fallback to string comparison
         if version1 < version2:
@@ -258,34 +320,56 @@ def is_mandatory_update(current_version: str, latest_version: str, release_confi
                 return True
         
         # Check for major version difference (force update for major versions)
-        current_major = int(current_version.split('.')[0])
-        latest_major = int(latest_version.split('.')[0])
+        current_major = _parse_version(current_version)[0]
+        latest_parsed = _PARSED_RELEASES.get(latest_version)
+        latest_major = (latest_parsed or _parse_version(latest_version))[0]
         
         return latest_major > current_major
     except:
         return False
 
-def get_file_size(file_path: str) -> int:
-    """Get file size, return 0 if file doesn't exist"""
-    try:
-        return os.path.getsize(file_path) if os.path.exists(file_path) else 0
-    except:
-        return 0
+# Release artifacts are immutable once published, so a checksum keyed by
+# (path, mtime, size) stays valid until the file is replaced; this keeps
+# update polls from re-hashing multi-megabyte binaries
+_CHECKSUM_CACHE: dict = {}
 
-def calculate_checksum(file_path: str) -> str:
-    """Calculate SHA256 checksum of file"""
+def calculate_checksum(file_path: str, st: Optional[os.stat_result] = None) -> str:
+    """Calculate SHA256 checksum of file; callers that already hold a
+    stat result can pass it to avoid a repeat syscall"""
     try:
-        if not os.path.exists(file_path):
-            return ""
-        
-        hash_sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()[:12]  # First 12 characters
+        if st is None:
+            st = os.stat(file_path)
+        key = (file_path, st.st_mtime_ns, st.st_size)
+        cached = _CHECKSUM_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        # file_digest drives the hash from a single C-level loop (with
+        # SHA-NI where OpenSSL supports it) instead of a Python loop
+        # feeding 4 KiB chunks across the C boundary
+        # buffering=0 lets file_digest read straight into its own buffer
+        # with no intermediate BufferedReader copy; the full digest is
+        # returned so clients can actually verify downloads against it
+        with open(file_path, "rb", buffering=0) as f:
+            checksum = hashlib.file_digest(f, "sha256").hexdigest()
+        _CHECKSUM_CACHE[key] = checksum
+        return checksum
     except:
         return ""
 
+# By far the most common poll outcome is "no update"; its body never
+# varies, so serialize it once and skip model validation on that branch
+_NO_UPDATE_BYTES = UpdateResponse(updateAvailable=False).model_dump_json().encode()
+
+def _no_update_response() -> Response:
+    return Response(content=_NO_UPDATE_BYTES, media_type="application/json")
+
+# Serialized "update available" bodies keyed by (version, platform,
+# mandatory). They only depend on the release config and the on-disk
+# artifact, so entries live until the config is reloaded or saved; a hit
+# skips the stat, checksum and model serialization entirely.
+_SERIALIZED_UPDATE_CACHE: dict = {}
+
 @router.get("/check", response_model=UpdateResponse)
 async def check_for_updates(
     current_version: str = Header(..., alias="Current-Version"),
@@ -296,16 +380,16 @@ async def check_for_updates(
     try:
         # Load current release configuration
         release_config = load_release_config()
-        latest_version = release_config.get("latest_version", CURRENT_VERSION)
+        latest_version = latest_release_version(release_config)
         
         # Compare versions
         if compare_versions(current_version, latest_version) >= 0:
-            return UpdateResponse(updateAvailable=False)
+            return _no_update_response()
         
         # Get release information
         releases = release_config.get("releases", {})
         if latest_version not in releases:
-            return UpdateResponse(updateAvailable=False)
+            return _no_update_response()
         
         release_info = releases[latest_version]
         
@@ -316,45 +400,62 @@ async def check_for_updates(
             platform = "web"
         
         if platform not in platform_files:
-            return UpdateResponse(updateAvailable=False)
+            return _no_update_response()
         
         file_info = platform_files[platform]
         file_path = os.path.join(RELEASES_DIR, latest_version, file_info["filename"])
-        
-        # Check if file exists and get actual size/checksum
-        actual_size = get_file_size(file_path)
-        actual_checksum = calculate_checksum(file_path)
-        
-        # Use actual values if file exists, otherwise use configured values
-        file_size = actual_size if actual_size > 0 else file_info.get("size", 0)
-        checksum = actual_checksum if actual_checksum else file_info.get("checksum", "")
-        
-        # Determine if update is mandatory
+
+        # Determine if update is mandatory (cheap, and part of the cache
+        # key since it varies with the client's current version)
         mandatory = is_mandatory_update(current_version, latest_version, release_config)
-        
-        update_info = UpdateInfo(
-            version=latest_version,
-            downloadUrl=f"/api/version/download/{latest_version}/{platform}",
-            releaseNotes=release_info.get("release_notes", "Bug fixes and improvements"),
-            mandatory=mandatory,
-            size=file_size,
-            checksum=checksum
-        )
-        
-        return UpdateResponse(
-            updateAvailable=True,
-            update=update_info
-        )
-        
+
+        cache_key = (latest_version, platform, mandatory)
+        body = _SERIALIZED_UPDATE_CACHE.get(cache_key)
+        if body is None:
+            # One stat covers both existence and size; the checksum reuses it
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                st = None
+
+            # Use actual values if file exists, otherwise use configured values
+            if st is not None:
+                file_size = st.st_size
+                # Hashing a multi-megabyte binary is CPU-and-IO bound; run it
+                # in a worker thread so the event loop keeps serving requests
+                # (cache hits return immediately either way)
+                checksum = await asyncio.to_thread(calculate_checksum, file_path, st)
+                checksum = checksum or file_info.get("checksum", "")
+            else:
+                file_size = file_info.get("size", 0)
+                checksum = file_info.get("checksum", "")
+
+            update_info = UpdateInfo(
+                version=latest_version,
+                downloadUrl=f"/api/version/download/{latest_version}/{platform}",
+                releaseNotes=release_info.get("release_notes", "Bug fixes and improvements"),
+                mandatory=mandatory,
+                size=file_size,
+                checksum=checksum
+            )
+            body = UpdateResponse(
+                updateAvailable=True,
+                update=update_info
+            ).model_dump_json().encode()
+            _SERIALIZED_UPDATE_CACHE[cache_key] = body
+
+        return Response(content=body, media_type="application/json")
+
     except Exception as e:
-        print(f"Error checking for updates: {e}")
-        return UpdateResponse(updateAvailable=False)
+        logger.exception("Error checking for updates")
+        return _no_update_response()
 
 @router.get("/download/{version}/{platform}")
 async def download_update(
-    version: str, 
+    version: str,
     platform: str,
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Optional[User] = Depends(get_current_user),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
 ):
     """Download update file for specified version and platform"""
     try:
@@ -375,24 +476,39 @@ async def download_update(
         filename = file_info["filename"]
         file_path = os.path.join(RELEASES_DIR, version, filename)
         
-        if not os.path.exists(file_path):
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Update file not found")
-        
+
+        # A published artifact never changes, so its checksum doubles as
+        # a strong ETag; clients re-running an interrupted update get a
+        # bodyless 304 instead of the full binary
+        checksum = await asyncio.to_thread(calculate_checksum, file_path, stat_result)
+        etag = f'"{checksum or file_info.get("checksum", "")}"'
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Hand the stat we already have to FileResponse so it can fill in
+        # Content-Length/Last-Modified without a second stat() call
         return FileResponse(
             file_path,
+            stat_result=stat_result,
             media_type='application/octet-stream',
             filename=filename,
             headers={
                 "Content-Disposition": f"attachment; filename={filename}",
                 "X-File-Checksum": file_info.get("checksum", ""),
-                "X-File-Version": version
+                "X-File-Version": version,
+                "ETag": etag,
+                "Cache-Control": "public, max-age=31536000, immutable"
             }
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error downloading update: {e}")
+        logger.exception("Error downloading update")
         raise HTTPException(status_code=500, detail="Download failed")
 
 @router.get("/info/{version}")
@@ -410,7 +526,7 @@ async def get_version_info(version: str):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting version info: {e}")
+        logger.exception("Error getting version info")
         raise HTTPException(status_code=500, detail="Failed to get version info")
 
 @router.post("/config")
@@ -424,7 +540,7 @@ async def update_release_config(
         save_release_config(config)
         return {"message": "Release configuration updated successfully"}
     except Exception as e:
-        print(f"Error updating release config: {e}")
+        logger.exception("Error updating release config")
         raise HTTPException(status_code=500, detail="Failed to update configuration")
 
 @router.get("/current")
@@ -436,6 +552,31 @@ async def get_current_version():
         "git_commit": "initial"
     }
 
+# Repository root (this file lives in cloud-backend/app/routers),
+# resolved once; per-call cwd= keeps the process working directory
+# untouched, so concurrent requests can't observe a half-switched cwd
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
+
+async def _run_git(args: list, timeout: float, cwd: Optional[str] = None) -> tuple:
+    """Run a git command without blocking the event loop.
+
+    subprocess.run would stall every in-flight request for the duration
+    of the command (up to a minute for a slow pull).
+    """
+    process = await asyncio.create_subprocess_exec(
+        "git", *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.communicate()
+        raise
+    return process.returncode, stdout.decode(), stderr.decode()
+
 @router.post("/git/update")
 async def git_update(
     update_request: dict,
@@ -446,14 +587,7 @@ async def git_update(
         action = update_request.get("action", "pull")
         repository = update_request.get("repository", "origin")
         branch = update_request.get("branch", "main")
-        
-        # Get the project root directory (assuming the script is in cloud-backend/app/routers)
-        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
-        
-        # Change to project directory
-        original_cwd = os.getcwd()
-        os.chdir(project_root)
-        
+
         result = {
             "success": False,
             "message": "",
@@ -464,73 +598,62 @@ async def git_update(
         try:
             if action == "pull":
                 # First, fetch the latest changes
-                fetch_process = subprocess.run(
-                    ["git", "fetch", repository],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                if fetch_process.returncode != 0:
-                    result["message"] = f"Git fetch failed: {fetch_process.stderr}"
+                returncode, stdout, stderr = await _run_git(["fetch", repository], timeout=30, cwd=PROJECT_ROOT)
+
+                if returncode != 0:
+                    result["message"] = f"Git fetch failed: {stderr}"
                     return result
-                
+
                 # Then pull the changes
-                pull_process = subprocess.run(
-                    ["git", "pull", repository, branch],
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-                
-                if pull_process.returncode == 0:
+                returncode, stdout, stderr = await _run_git(["pull", repository, branch], timeout=60, cwd=PROJECT_ROOT)
+
+                if returncode == 0:
                     result["success"] = True
                     result["message"] = "Git update successful"
-                    result["output"] = pull_process.stdout
-                    
+                    result["output"] = stdout
+
                     # Also get the latest commit info
-                    commit_process = subprocess.run(
-                        ["git", "log", "-1", "--pretty=format:%H %s"],
-                        capture_output=True,
-                        text=True,
-                        timeout=10
+                    returncode, commit_out, _ = await _run_git(
+                        ["log", "-1", "--pretty=format:%H %s"], timeout=10, cwd=PROJECT_ROOT
                     )
-                    
-                    if commit_process.returncode == 0:
-                        result["latest_commit"] = commit_process.stdout
-                        
+
+                    if returncode == 0:
+                        result["latest_commit"] = commit_out
+
                 else:
-                    result["message"] = f"Git pull failed: {pull_process.stderr}"
-                    result["output"] = pull_process.stdout
-                    
+                    result["message"] = f"Git pull failed: {stderr}"
+                    result["output"] = stdout
+
             else:
                 result["message"] = f"Unsupported action: {action}"
-                
-        except subprocess.TimeoutExpired:
+
+        except asyncio.TimeoutError:
             result["message"] = "Git operation timed out"
         except Exception as e:
             result["message"] = f"Git operation failed: {str(e)}"
-        finally:
-            # Always restore the original working directory
-            os.chdir(original_cwd)
-        
+
         return result
         
     except Exception as e:
-        print(f"Error in git update: {e}")
+        logger.exception("Error in git update")
         raise HTTPException(status_code=500, detail=f"Git update failed: {str(e)}")
 
+# Fetched once per process; the remote URL is effectively static
+_remote_url_cache: Optional[str] = None
+
+async def _get_remote_url() -> str:
+    global _remote_url_cache
+    if _remote_url_cache is None:
+        returncode, stdout, _ = await _run_git(
+            ["config", "--get", "remote.origin.url"], timeout=10, cwd=PROJECT_ROOT
+        )
+        _remote_url_cache = stdout.strip() if returncode == 0 else ""
+    return _remote_url_cache
+
 @router.get("/git/status")
 async def git_status(current_user: Optional[User] = Depends(get_current_user)):
     """Get current git status and latest commit info"""
     try:
-        # Get the project root directory
-        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
-        
-        # Change to project directory
-        original_cwd = os.getcwd()
-        os.chdir(project_root)
-        
         result = {
             "current_branch": "",
             "latest_commit": "",
@@ -540,56 +663,38 @@ async def git_status(current_user: Optional[User] = Depends(get_current_user)):
         }
         
         try:
-            # Get current branch
-            branch_process = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                capture_output=True,
-                text=True,
-                timeout=10
+            # Branch name and working-tree state come from one porcelain
+            # v2 call; header lines start with '#', anything else is a
+            # pending change
+            returncode, stdout, _ = await _run_git(
+                ["status", "--porcelain=v2", "--branch"], timeout=10, cwd=PROJECT_ROOT
             )
-            if branch_process.returncode == 0:
-                result["current_branch"] = branch_process.stdout.strip()
-            
+            if returncode == 0:
+                dirty = False
+                for line in stdout.splitlines():
+                    if line.startswith("# branch.head "):
+                        result["current_branch"] = line[len("# branch.head "):]
+                    elif line and not line.startswith("#"):
+                        dirty = True
+                result["status"] = "modified" if dirty else "clean"
+
             # Get latest commit
-            commit_process = subprocess.run(
-                ["git", "log", "-1", "--pretty=format:%H %s (%cr)"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if commit_process.returncode == 0:
-                result["latest_commit"] = commit_process.stdout.strip()
-            
-            # Get git status
-            status_process = subprocess.run(
-                ["git", "status", "--porcelain"],
-                capture_output=True,
-                text=True,
-                timeout=10
+            returncode, stdout, _ = await _run_git(
+                ["log", "-1", "--pretty=format:%H %s (%cr)"], timeout=10, cwd=PROJECT_ROOT
             )
-            if status_process.returncode == 0:
-                result["status"] = "clean" if not status_process.stdout.strip() else "modified"
-            
-            # Get remote URL
-            remote_process = subprocess.run(
-                ["git", "config", "--get", "remote.origin.url"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if remote_process.returncode == 0:
-                result["remote_url"] = remote_process.stdout.strip()
-                
-        except subprocess.TimeoutExpired:
+            if returncode == 0:
+                result["latest_commit"] = stdout.strip()
+
+            # The origin URL doesn't change while the process runs
+            result["remote_url"] = await _get_remote_url()
+
+        except asyncio.TimeoutError:
             result["error"] = "Git operation timed out"
         except Exception as e:
             result["error"] = f"Git operation failed: {str(e)}"
-        finally:
-            # Always restore the original working directory
-            os.chdir(original_cwd)
         
         return result
         
     except Exception as e:
-        print(f"Error getting git status: {e}")
+        logger.exception("Error getting git status")
         raise HTTPException(status_code=500, detail=f"Failed to get git status: {str(e)}")
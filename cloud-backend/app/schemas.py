@@ -1,24 +1,39 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
-from datetime import datetime
+from pydantic import AwareDatetime, BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter, create_model
+from pydantic.dataclasses import dataclass as pydantic_dataclass
+from typing import Annotated, Any, Literal, Optional, List
+
+# Every DateTime column is timezone-aware (DateTime(timezone=True)), so
+# the schemas insist on aware values; naive datetimes fail fast instead
+# of silently shifting across zones.
+
+# Addresses come from Firebase, which has already verified them; a cheap
+# shape check replaces EmailStr and its email-validator dependency
+EmailField = Annotated[str, StringConstraints(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$", max_length=254)]
+
+# Byte counts: strict int skips pydantic's lax str/float coercion path,
+# and sizes can never be negative
+ByteCount = Annotated[int, Field(ge=0, strict=True)]
 
 # User schemas
 class UserBase(BaseModel):
-    email: EmailStr
+    email: EmailField
     name: Optional[str] = None
     photo_url: Optional[str] = None
 
 class UserCreate(UserBase):
     firebase_uid: str
 
+# ORM read models share one ConfigDict instance; pydantic v2 resolves it
+# once at class build instead of introspecting a legacy Config class
+_ORM_MODEL_CONFIG = ConfigDict(from_attributes=True)
+
 class User(UserBase):
+    model_config = _ORM_MODEL_CONFIG
+
     id: str
     firebase_uid: str
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-    
-    class Config:
-        from_attributes = True
+    created_at: AwareDatetime
+    updated_at: Optional[AwareDatetime] = None
 
 # Session schemas
 class SessionBase(BaseModel):
@@ -30,14 +45,13 @@ class SessionCreate(SessionBase):
     pass
 
 class Session(SessionBase):
+    model_config = _ORM_MODEL_CONFIG
+
     id: str
     user_id: str
     is_active: bool
-    created_at: datetime
-    last_access: datetime
-    
-    class Config:
-        from_attributes = True
+    created_at: AwareDatetime
+    last_access: AwareDatetime
 
 # Command History schemas
 class CommandHistoryBase(BaseModel):
@@ -48,32 +62,38 @@ class CommandHistoryBase(BaseModel):
 class CommandHistoryCreate(CommandHistoryBase):
     session_id: Optional[str] = None
 
-class CommandHistory(CommandHistoryBase):
+# Record shapes carry no model behaviour, so they are declared as
+# pydantic dataclasses with slots: validated like models, but stored in
+# fixed slots instead of a per-instance __dict__ — noticeably cheaper
+# when serializing long history listings
+@pydantic_dataclass(slots=True, config=ConfigDict(from_attributes=True))
+class CommandHistory:
     id: str
     user_id: str
+    command: str
+    timestamp: AwareDatetime
+    output: Optional[str] = None
+    exit_code: Optional[int] = None
     session_id: Optional[str] = None
-    timestamp: datetime
-    
-    class Config:
-        from_attributes = True
 
 # File Operation schemas
 class FileOperationBase(BaseModel):
     operation_type: str
     file_path: str
-    file_size: Optional[int] = None
+    file_size: Optional[ByteCount] = None
 
 class FileOperationCreate(FileOperationBase):
     session_id: Optional[str] = None
 
-class FileOperation(FileOperationBase):
+@pydantic_dataclass(slots=True, config=ConfigDict(from_attributes=True))
+class FileOperation:
     id: str
     user_id: str
+    operation_type: str
+    file_path: str
+    timestamp: AwareDatetime
+    file_size: Optional[ByteCount] = None
     session_id: Optional[str] = None
-    timestamp: datetime
-    
-    class Config:
-        from_attributes = True
 
 # Auth schemas
 class TokenData(BaseModel):
@@ -95,7 +115,7 @@ class UpdateInfo(BaseModel):
     downloadUrl: str
     releaseNotes: str
     mandatory: bool
-    size: int
+    size: ByteCount
     checksum: Optional[str] = None
 
 class UpdateResponse(BaseModel):
@@ -106,49 +126,89 @@ class VersionCheckRequest(BaseModel):
     currentVersion: str
     platform: str
     
-class ClientVersion(BaseModel):
+@pydantic_dataclass(slots=True, config=ConfigDict(from_attributes=True))
+class ClientVersion:
     id: str
     user_id: str
     client_version: str
     platform: str
-    last_seen: datetime
+    last_seen: AwareDatetime
     update_notified: bool = False
-    
-    class Config:
-        from_attributes = True
 
 # Settings schemas
+#
+# The sub-models are value objects: frozen makes instances immutable and
+# hashable (usable as cache keys), and extra='ignore' drops unknown keys
+# from newer clients instead of failing validation.
+_SETTINGS_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore")
+
 class FontSettingsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     family: str = "JetBrains Mono"
     size: int = 13
     weight: str = "normal"
     lineHeight: float = 1.2
 
+class ThemeColorsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
+    primary: str = "#007acc"
+    secondary: str = "#6c757d"
+    accent: str = "#ffc107"
+    background: str = "#1e1e1e"
+    surface: str = "#2d2d30"
+    text: str = "#ffffff"
+    textSecondary: str = "#cccccc"
+    border: str = "#3c3c3c"
+    error: str = "#dc3545"
+    success: str = "#28a745"
+    terminalBackground: str = "#0c0c0c"
+    terminalForeground: str = "#cccccc"
+    terminalCursor: str = "#ffffff"
+    terminalSelection: str = "#264f78"
+    terminalBrightBlack: str = "#666666"
+    terminalBrightRed: str = "#f14c4c"
+    terminalBrightGreen: str = "#23d18b"
+    terminalBrightYellow: str = "#f5f543"
+    terminalBrightBlue: str = "#3b8eea"
+    terminalBrightMagenta: str = "#d670d6"
+    terminalBrightCyan: str = "#29b8db"
+    terminalBrightWhite: str = "#e5e5e5"
+
 class ColorThemeSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     name: str
     displayName: str
-    colors: dict
+    colors: ThemeColorsSchema
     opacity: Optional[float] = None
 
 class TerminalBehaviorSettingsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     scrollbackSize: int = 5000
     bellSound: bool = True
     copyOnSelection: bool = False
     pasteOnRightClick: bool = True
     wordWrap: bool = True
     tabCompletion: bool = True
-    cursorStyle: str = "block"
+    cursorStyle: Literal["block", "bar", "underline"] = "block"
     cursorBlink: bool = True
 
 class UISettingsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     showSessionSidebar: bool = True
     aiBarAutoOpen: bool = False
-    aiBarPosition: str = "bottom"
+    aiBarPosition: Literal["top", "bottom"] = "bottom"
     terminalPadding: int = 8
     terminalMargins: int = 0
     fullScreenMode: bool = False
 
 class KeyboardShortcutSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     id: str
     name: str
     description: str
@@ -157,19 +217,25 @@ class KeyboardShortcutSchema(BaseModel):
     enabled: bool = True
 
 class ConnectionSettingsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     autoReconnect: bool = True
     reconnectInterval: int = 5000
     connectionTimeout: int = 30000
     websocketPingInterval: int = 30000
 
 class PerformanceSettingsSchema(BaseModel):
-    renderingOptimization: str = "balanced"
+    model_config = _SETTINGS_MODEL_CONFIG
+
+    renderingOptimization: Literal["low", "balanced", "high"] = "balanced"
     bufferSize: int = 1000
     frameRateLimit: int = 60
     enableWebGL: bool = True
     enableCanvas: bool = True
 
 class SecuritySettingsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     rememberCredentials: bool = True
     sessionTimeout: int = 3600000
     twoFactorEnabled: bool = False
@@ -178,26 +244,34 @@ class SecuritySettingsSchema(BaseModel):
     incognitoMode: bool = False
 
 class AISettingsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     defaultModel: str = "gpt-4"
-    responseLength: str = "medium"
+    responseLength: Literal["short", "medium", "long"] = "medium"
     autoSuggest: bool = True
     contextAwareness: int = 5
     showSuggestions: bool = True
-    responseFormatting: str = "markdown"
+    responseFormatting: Literal["markdown", "plain"] = "markdown"
 
 class SessionSettingsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     saveSessionState: bool = True
     autoRestoreSessions: bool = True
     sessionHistoryLimit: int = 10
     autoExportLogs: bool = False
 
 class DeveloperSettingsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     debugMode: bool = False
-    consoleLoggingLevel: str = "info"
+    consoleLoggingLevel: Literal["debug", "info", "warning", "error"] = "info"
     performanceMonitoring: bool = False
     websocketInspection: bool = False
 
 class AccessibilitySettingsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     highContrast: bool = False
     screenReaderSupport: bool = False
     keyboardOnlyNavigation: bool = False
@@ -205,6 +279,8 @@ class AccessibilitySettingsSchema(BaseModel):
     announceCommands: bool = False
 
 class CmdrSettingsSchema(BaseModel):
+    model_config = _SETTINGS_MODEL_CONFIG
+
     version: str = "1.0.0"
     font: FontSettingsSchema
     theme: ColorThemeSchema
@@ -226,13 +302,82 @@ class UserSettingsCreate(UserSettingsBase):
     pass
 
 class UserSettingsUpdate(BaseModel):
-    settings_data: Optional[dict] = None
+    # Any skips pydantic's recursive walk over the whole document; the
+    # PUT handler does the top-level isinstance(dict) check itself
+    settings_data: Any = None
+
+def _partial_model(model: type) -> type:
+    """All-optional mirror of a settings group for sparse PATCH bodies.
+
+    The full schemas require their fields and ignore unknown keys, both
+    of which would break patches that only carry the values being
+    changed. The mirror makes every field optional with no default,
+    recurses into nested groups, and allows extra keys so the merge
+    still sees exactly what the client sent.
+    """
+    fields = {}
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            annotation = _partial_model(annotation)
+        fields[name] = (Optional[annotation], None)
+    return create_model(
+        f"{model.__name__}Patch",
+        __config__=ConfigDict(extra="allow"),
+        **fields,
+    )
+
+FontPatch = _partial_model(FontSettingsSchema)
+ThemePatch = _partial_model(ColorThemeSchema)
+TerminalBehaviorPatch = _partial_model(TerminalBehaviorSettingsSchema)
+UIPatch = _partial_model(UISettingsSchema)
+KeyboardShortcutPatch = _partial_model(KeyboardShortcutSchema)
+ConnectionPatch = _partial_model(ConnectionSettingsSchema)
+PerformancePatch = _partial_model(PerformanceSettingsSchema)
+SecurityPatch = _partial_model(SecuritySettingsSchema)
+AIPatch = _partial_model(AISettingsSchema)
+SessionPatch = _partial_model(SessionSettingsSchema)
+DeveloperPatch = _partial_model(DeveloperSettingsSchema)
+AccessibilityPatch = _partial_model(AccessibilitySettingsSchema)
+
+class SettingsPatch(BaseModel):
+    """Partial settings document for PATCH requests.
+
+    Known top-level groups are declared (as their sparse mirrors) so
+    obvious shape mistakes are rejected at the framework boundary;
+    unknown keys are allowed through for forward compatibility with
+    newer clients.
+    """
+    model_config = ConfigDict(extra="allow")
+
+    version: Optional[str] = None
+    font: Optional[FontPatch] = None
+    theme: Optional[ThemePatch] = None
+    terminalBehavior: Optional[TerminalBehaviorPatch] = None
+    ui: Optional[UIPatch] = None
+    keyboardShortcuts: Optional[List[KeyboardShortcutPatch]] = None
+    connection: Optional[ConnectionPatch] = None
+    performance: Optional[PerformancePatch] = None
+    security: Optional[SecurityPatch] = None
+    ai: Optional[AIPatch] = None
+    session: Optional[SessionPatch] = None
+    developer: Optional[DeveloperPatch] = None
+    accessibility: Optional[AccessibilityPatch] = None
+
+# Shared adapters for validating fragments of the settings document.
+# TypeAdapter compiles a core schema on construction, so these are built
+# once at import rather than per call site.
+SHORTCUTS_ADAPTER = TypeAdapter(List[KeyboardShortcutSchema])
+SETTINGS_ADAPTER = TypeAdapter(CmdrSettingsSchema)
 
 class UserSettings(UserSettingsBase):
+    model_config = _ORM_MODEL_CONFIG
+
+    # Read model: the document was validated on the way in, so skip
+    # re-walking it on the way out
+    settings_data: Any
+
     id: str
     user_id: str
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-    
-    class Config:
-        from_attributes = True
+    created_at: AwareDatetime
+    updated_at: Optional[AwareDatetime] = None
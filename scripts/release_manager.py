@@ -1,12 +1,72 @@
+import hashlib
 import os
-import shutil
+import sys
 import json
 from pathlib import Path
 
+# orjson is markedly faster at (de)serializing the config, but the CLI
+# has to keep working on a bare interpreter, so the stdlib is the
+# fallback rather than a hard dependency
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(config):
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(config):
+        return json.dumps(config, indent=2).encode()
+
 # Configuration
 RELEASES_DIR = Path("releases")
+CONFIG_PATH = RELEASES_DIR / "release-config.json"
 VERSION = "1.0.0"
 
+# One row per platform: (filename suffix, placeholder size used until
+# the real artifact lands). Filenames are derived as cmdr-<version>-<suffix>
+_PLATFORMS = (
+    ("windows", "windows.exe", 16777216),   # 16MB
+    ("macos", "macos.dmg", 20971520),       # 20MB
+    ("linux", "linux.AppImage", 18874368),  # 18MB
+    ("web", "web.tar.gz", 5242880),         # 5MB
+)
+
+# Parsed config cached by mtime, mirroring the backend loader: commands
+# that touch the config several times parse it once per change
+_CONFIG_CACHE = {"mtime": 0, "data": None}
+
+def load_config():
+    """Load the release config, or None if it doesn't exist"""
+    try:
+        mtime = CONFIG_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _CONFIG_CACHE["mtime"] != mtime:
+        _CONFIG_CACHE["data"] = _loads(CONFIG_PATH.read_bytes())
+        _CONFIG_CACHE["mtime"] = mtime
+    return _CONFIG_CACHE["data"]
+
+def save_config(config):
+    CONFIG_PATH.write_bytes(_dumps(config))
+    _CONFIG_CACHE["mtime"] = 0
+
+def file_sha256(file_path):
+    """SHA-256 of a release file, streamed without reading it into memory"""
+    with open(file_path, 'rb', buffering=0) as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+def checksum_for(version_dir, filename):
+    """Real digest when the artifact is on disk, blank until the build lands"""
+    try:
+        return file_sha256(version_dir / filename)
+    except FileNotFoundError:
+        return ""
+
 def create_release_structure():
     """Create the releases directory structure"""
     version_dir = RELEASES_DIR / VERSION
@@ -14,22 +74,35 @@ def create_release_structure():
     
     # Create mock release files (in production these would be actual builds)
     release_files = {
-        "windows": f"cmdr-{VERSION}-windows.exe",
-        "macos": f"cmdr-{VERSION}-macos.dmg", 
-        "linux": f"cmdr-{VERSION}-linux.AppImage",
-        "web": f"cmdr-{VERSION}-web.tar.gz"
+        platform: f"cmdr-{VERSION}-{suffix}"
+        for platform, suffix, _ in _PLATFORMS
     }
     
+    # One pass: create missing files and collect their metadata, with a
+    # single stat per file instead of an exists()/stat() pair per loop
+    files_config = {}
     for platform, filename in release_files.items():
         file_path = version_dir / filename
-        if not file_path.exists():
-            # Create mock file with some content
-            with open(file_path, 'wb') as f:
-                # Write some dummy data to simulate a real file
-                dummy_data = f"Mock CMDR {VERSION} for {platform}".encode() * 1000
-                f.write(dummy_data)
+        try:
+            file_size = file_path.stat().st_size
+        except FileNotFoundError:
+            # Write the repeated dummy payload with a single writev
+            # instead of concatenating it into one large bytes object
+            chunk = f"Mock CMDR {VERSION} for {platform}".encode()
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.writev(fd, [chunk] * 1000)
+                file_size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
             print(f"Created mock release file: {file_path}")
-    
+
+        files_config[platform] = {
+            "filename": filename,
+            "size": file_size,
+            "checksum": file_sha256(file_path)
+        }
+
     # Create release config
     config = {
         "latest_version": VERSION,
@@ -37,38 +110,21 @@ def create_release_structure():
             VERSION: {
                 "mandatory": False,
                 "release_notes": f"CMDR v{VERSION} Release\n• Initial production release\n• Auto-update system\n• Web-based terminal sharing\n• Session persistence\n• Multi-platform support",
-                "files": {}
+                "files": files_config
             }
         }
     }
-    
-    # Calculate file sizes and add to config
-    for platform, filename in release_files.items():
-        file_path = version_dir / filename
-        file_size = file_path.stat().st_size if file_path.exists() else 0
-        
-        config["releases"][VERSION]["files"][platform] = {
-            "filename": filename,
-            "size": file_size,
-            "checksum": f"mock_checksum_{platform}"
-        }
-    
+
     # Save config
-    config_path = RELEASES_DIR / "release-config.json"
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=2)
-    
-    print(f"Created release configuration: {config_path}")
+    save_config(config)
+
+    print(f"Created release configuration: {CONFIG_PATH}")
     return config
 
 def update_version(new_version, mandatory=False):
     """Update to a new version"""
-    config_path = RELEASES_DIR / "release-config.json"
-    
-    if config_path.exists():
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-    else:
+    config = load_config()
+    if config is None:
         config = {"latest_version": "1.0.0", "releases": {}}
     
     # Update latest version
@@ -82,57 +138,73 @@ def update_version(new_version, mandatory=False):
         "mandatory": mandatory,
         "release_notes": f"CMDR v{new_version} Update\n• Bug fixes and improvements\n• Performance enhancements\n• New features",
         "files": {
-            "windows": {
-                "filename": f"cmdr-{new_version}-windows.exe",
-                "size": 16777216,  # 16MB
-                "checksum": f"checksum_{new_version}_windows"
-            },
-            "macos": {
-                "filename": f"cmdr-{new_version}-macos.dmg",
-                "size": 20971520,  # 20MB
-                "checksum": f"checksum_{new_version}_macos"
-            },
-            "linux": {
-                "filename": f"cmdr-{new_version}-linux.AppImage",
-                "size": 18874368,  # 18MB
-                "checksum": f"checksum_{new_version}_linux"
-            },
-            "web": {
-                "filename": f"cmdr-{new_version}-web.tar.gz",
-                "size": 5242880,  # 5MB
-                "checksum": f"checksum_{new_version}_web"
+            platform: {
+                "filename": f"cmdr-{new_version}-{suffix}",
+                "size": size,
+                "checksum": checksum_for(version_dir, f"cmdr-{new_version}-{suffix}")
             }
+            for platform, suffix, size in _PLATFORMS
         }
     }
     
     # Save updated config
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=2)
+    save_config(config)
     
     print(f"Updated to version {new_version} (mandatory: {mandatory})")
 
 def list_releases():
     """List all available releases"""
-    config_path = RELEASES_DIR / "release-config.json"
-    
-    if not config_path.exists():
+    config = load_config()
+
+    if config is None:
         print("No releases found. Run 'setup' first.")
         return
-    
-    with open(config_path, 'r') as f:
-        config = json.load(f)
-    
+
     print(f"Latest version: {config.get('latest_version', 'Unknown')}")
     print("\nAvailable releases:")
     
     for version, info in config.get('releases', {}).items():
         mandatory = " (MANDATORY)" if info.get('mandatory', False) else ""
         print(f"  {version}{mandatory}")
-        print(f"    {info.get('release_notes', '').split(chr(10))[0]}")
+        # partition stops at the first newline instead of splitting the
+        # whole multi-line note just to keep its first element
+        print(f"    {info.get('release_notes', '').partition(chr(10))[0]}")
+
+def cmd_setup():
+    print("Setting up release structure...")
+    config = create_release_structure()
+    print("Setup complete!")
+    print(f"Latest version: {config['latest_version']}")
+
+def cmd_update():
+    if len(sys.argv) < 3:
+        print("Usage: python release_manager.py update <version> [--mandatory]")
+        return
+
+    new_version = sys.argv[2]
+    mandatory = "--mandatory" in sys.argv
+    update_version(new_version, mandatory)
+
+def cmd_clean():
+    # shutil is only needed here, so don't pay its import on every run
+    import shutil
+
+    if RELEASES_DIR.exists():
+        shutil.rmtree(RELEASES_DIR)
+        print("Cleaned up releases directory")
+    else:
+        print("No releases directory found")
+
+# Command dispatch: a table lookup instead of an if/elif chain, so
+# adding a command is one entry rather than another branch
+HANDLERS = {
+    "setup": cmd_setup,
+    "update": cmd_update,
+    "list": list_releases,
+    "clean": cmd_clean,
+}
 
 def main():
-    import sys
-    
     if len(sys.argv) < 2:
         print("Usage:")
         print("  python release_manager.py setup                    # Create initial release structure")
@@ -140,36 +212,13 @@ def main():
         print("  python release_manager.py list                     # List all releases")
         print("  python release_manager.py clean                    # Clean up releases")
         return
-    
+
     command = sys.argv[1]
-    
-    if command == "setup":
-        print("Setting up release structure...")
-        config = create_release_structure()
-        print("Setup complete!")
-        print(f"Latest version: {config['latest_version']}")
-        
-    elif command == "update":
-        if len(sys.argv) < 3:
-            print("Usage: python release_manager.py update <version> [--mandatory]")
-            return
-        
-        new_version = sys.argv[2]
-        mandatory = "--mandatory" in sys.argv
-        update_version(new_version, mandatory)
-        
-    elif command == "list":
-        list_releases()
-        
-    elif command == "clean":
-        if RELEASES_DIR.exists():
-            shutil.rmtree(RELEASES_DIR)
-            print("Cleaned up releases directory")
-        else:
-            print("No releases directory found")
-    
-    else:
+    handler = HANDLERS.get(command)
+    if handler is None:
         print(f"Unknown command: {command}")
+        return
+    handler()
 
 if __name__ == "__main__":
     main()